@@ -1,113 +1,85 @@
 from Token import Token, TokenType
-from typing import Any
+from typing import Any, Iterator
+import re
+
+# Every kind of token as one named alternative, so a single finditer pass over the source (done in C by the regex engine)
+# does all the scanning. Group names match the TokenType they produce, and ILLEGAL catches any character nothing else did
+TOKEN_PATTERN: re.Pattern = re.compile(r"""
+      (?P<NEWLINE>\n)
+    | (?P<WHITESPACE>[ \t\r]+)
+    | (?P<NUMBER>\d+(?:\.\d*)*)
+    | (?P<PLUS>\+)
+    | (?P<MINUS>-)
+    | (?P<ASTERISK>\*)
+    | (?P<SLASH>/)
+    | (?P<POW>\^)
+    | (?P<MODULUS>%)
+    | (?P<SEMICOLON>;)
+    | (?P<LPAREN>\()
+    | (?P<RPAREN>\))
+    | (?P<ILLEGAL>.)
+""", re.VERBOSE)
 
 class Lexer:
     def __init__(self, source: str) -> None:
         self.source = source
 
-        self.position: int = -1
-        self.read_position: int = 0
         self.line_no: int = 1
 
-        self.current_char: str | None = None
-
-        self.__read_char()
-
-    def __read_char(self) -> None:
-        """ Reads the next char in the source input file """
-        if self.read_position >= len(self.source):
-            self.current_char = None
-        else:
-            self.current_char = self.source[self.read_position]
+        self.__tokens: Iterator[Token] = self.__scan()
+        self.__eof_token: Token | None = None
 
-        self.position = self.read_position
-        self.read_position += 1
-
-    # def __peek_char(self) -> str | None:
-    #     """ Peeks to the upcoming char without advancing the lexer position """
-    #     if self.read_position >= len(self.source):
-    #         return None
-        
-    #     return self.source[self.read_position]
-    
-    def __skip_whitespace(self) -> None:
-        """ Skips whitespace and other ignored characters """
-        while self.current_char in [' ', '\t', '\n', '\r']:
-            # Advance the line number if this is a line break
-            if self.current_char == '\n':
-                self.line_no += 1
-            
-            self.__read_char()
-
-    def __new_token(self, tt: TokenType, literal: Any) -> Token:
+    def __new_token(self, tt: TokenType, literal: Any, position: int) -> Token:
         """ Creates and returns a new token from specified values """
-        return Token(type=tt, literal=literal, line_no=self.line_no, position=self.position)
-    
-    def __is_digit(self, ch: str) -> bool:
-        """ Checks if the character is a digit """
-        return '0' <= ch and ch <= '9'
-    
-    def __read_number(self) -> Token:
-        """ Reads a number from the input file and returns a Token """
-        start_pos: int = self.position
-        dot_count: int = 0
-
-        output: str = ""
-        while self.__is_digit(self.current_char) or self.current_char == '.':
-            if self.current_char == '.':
-                dot_count += 1
-            
-            if dot_count > 1:
-                print(f"Too many decimals in number on line {self.line_no}, position {self.position}")
-                return self.__new_token(TokenType.ILLEGAL, self.source[start_pos:self.position])
-            
-            output += self.source[self.position]
-            self.__read_char()
+        return Token(type=tt, literal=literal, line_no=self.line_no, position=position)
 
-            if self.current_char is None:
-                break
+    def __read_number(self, literal: str, position: int) -> Token:
+        """ Turns a scanned run of digits and dots into an INT or FLOAT Token """
+        dot_count: int = literal.count('.')
 
         if dot_count == 0:
-            return self.__new_token(TokenType.INT, int(output))
+            return self.__new_token(TokenType.INT, int(literal), position)
+        elif dot_count == 1:
+            return self.__new_token(TokenType.FLOAT, float(literal), position)
         else:
-            return self.__new_token(TokenType.FLOAT, float(output))
-    
-    def next_token(self) -> list[Token]:
+            print(f"Too many decimals in number on line {self.line_no}, position {position}")
+            return self.__new_token(TokenType.ILLEGAL, literal, position)
+
+    def __scan(self) -> Iterator[Token]:
+        """ Scans the whole source in one pass of TOKEN_PATTERN, yielding tokens and ending with EOF """
+        for m in TOKEN_PATTERN.finditer(self.source):
+            kind: str = m.lastgroup
+            match kind:
+                case 'NEWLINE':
+                    self.line_no += 1
+                case 'WHITESPACE':
+                    pass
+                case 'NUMBER':
+                    yield self.__read_number(m.group(), m.start())
+                case _:
+                    yield self.__new_token(TokenType[kind], m.group(), m.start())
+
+        yield self.__new_token(TokenType.EOF, "", len(self.source))
+
+    def next_token(self) -> Token:
         """
             Main function for executing the Lexer
         """
-        tok: Token = None
+        # Once the source is used up, keep handing back the EOF token
+        if self.__eof_token is not None:
+            return self.__eof_token
 
-        # Skip the whitespace and ignored characters
-        self.__skip_whitespace()
+        tok: Token = next(self.__tokens)
+        if tok.type == TokenType.EOF:
+            self.__eof_token = tok
 
-        match self.current_char:
-            case '+':
-                tok = self.__new_token(TokenType.PLUS, self.current_char)
-            case '-':
-                tok = self.__new_token(TokenType.MINUS, self.current_char)
-            case '*':
-                tok = self.__new_token(TokenType.ASTERISK, self.current_char)
-            case '/':
-                tok = self.__new_token(TokenType.SLASH, self.current_char)
-            case '^':
-                tok = self.__new_token(TokenType.POW, self.current_char)
-            case '%':
-                tok = self.__new_token(TokenType.MODULUS, self.current_char)
-            case ';':
-                tok = self.__new_token(TokenType.SEMICOLON, self.current_char)
-            case '(':
-                tok = self.__new_token(TokenType.LPAREN, self.current_char)
-            case ')':
-                tok = self.__new_token(TokenType.RPAREN, self.current_char)
-            case None:
-                tok = self.__new_token(TokenType.EOF, "")
-            case _:
-                if self.__is_digit(self.current_char):
-                    tok = self.__read_number()
-                    return tok
-                else:
-                    tok = self.__new_token(TokenType.ILLEGAL, self.current_char)
-
-        self.__read_char()
         return tok
+
+    def __iter__(self) -> Iterator[Token]:
+        """ Yields every token in the source, ending with the EOF token """
+        while True:
+            tok: Token = self.next_token()
+            yield tok
+
+            if tok.type == TokenType.EOF:
+                return
\ No newline at end of file
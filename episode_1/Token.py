@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Any
+from typing import Any, NamedTuple
 
 class TokenType(Enum):
     # Special Tokens
@@ -24,12 +24,11 @@ class TokenType(Enum):
     RPAREN = "RPAREN"
 
 
-class Token:
-    def __init__(self, type: TokenType, literal: Any, line_no: int, position: int) -> None:
-        self.type = type
-        self.literal = literal
-        self.line_no = line_no
-        self.position = position
+class Token(NamedTuple):
+    type: TokenType
+    literal: Any
+    line_no: int
+    position: int
 
     def __str__(self) -> str:
         return f"Token[{self.type} : {self.literal} : Line {self.line_no} : Position {self.position}]"
@@ -8,6 +8,5 @@ if __name__ == '__main__':
         code: str = f.read()
 
     if LEXER_DEBUG:
-        debug_lex: Lexer = Lexer(source=code)
-        while debug_lex.current_char is not None:
-            print(debug_lex.next_token())
\ No newline at end of file
+        for tok in Lexer(source=code):
+            print(tok)
\ No newline at end of file
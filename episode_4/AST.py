@@ -1,5 +1,6 @@
-from abc import ABC, abstractmethod
+from collections import deque
 from enum import Enum
+from typing import Callable
 
 class NodeType(Enum):
     Program = "Program"
@@ -15,96 +16,119 @@ class NodeType(Enum):
     FloatLiteral = "FloatLiteral"
 
 
-class Node(ABC):
-    @abstractmethod
-    def type(self) -> NodeType:
-        """ Returns back the NodeType """
-        pass
+class Node:
+    __slots__ = ()
+
+    # The NodeType of this node, set once per subclass
+    type: NodeType
 
-    @abstractmethod
     def json(self) -> dict:
         """ Returns back the JSON representation of this AST node """
-        pass
+        return to_json(self)
 
 
 class Statement(Node):
-    pass
+    __slots__ = ()
 
 class Expression(Node):
-    pass
+    __slots__ = ()
 
 class Program(Node):
     """ The root node for the AST """
-    def __init__(self) -> None:
-        self.statements: list[Statement] = []
+    __slots__ = ('statements',)
+    type = NodeType.Program
 
-    def type(self) -> NodeType:
-        return NodeType.Program
-    
-    def json(self) -> dict:
-        return {
-            "type": self.type().value,
-            "statements": [{stmt.type().value: stmt.json()} for stmt in self.statements]
-        }
+    def __init__(self) -> None:
+        self.statements: list[Statement | Expression] = []
 
 # region Statements
 class ExpressionStatement(Statement):
+    __slots__ = ('expr',)
+    type = NodeType.ExpressionStatement
+
     def __init__(self, expr: Expression = None) -> None:
         self.expr: Expression = expr
-
-    def type(self) -> NodeType:
-        return NodeType.ExpressionStatement
-    
-    def json(self) -> dict:
-        return {
-            "type": self.type().value,
-            "expr": self.expr.json()
-        }
 # endregion
-    
+
 # region Expressions
 class InfixExpression(Expression):
+    __slots__ = ('left_node', 'operator', 'right_node')
+    type = NodeType.InfixExpression
+
     def __init__(self, left_node: Expression, operator: str, right_node: Expression = None):
         self.left_node: Expression = left_node
         self.operator: str = operator
         self.right_node: Expression = right_node
-
-    def type(self) -> NodeType:
-        return NodeType.InfixExpression
-    
-    def json(self) -> dict:
-        return {
-            "type": self.type().value,
-            "left_node": self.left_node.json(),
-            "operator": self.operator,
-            "right_node": self.right_node.json()
-        }
 # endregion
 
 # region Literals
+# A literal that makes up a whole statement on its own is stored directly in the statement list,
+# with is_statement set, instead of being wrapped in an ExpressionStatement
 class IntegerLiteral(Expression):
-    def __init__(self, value: int = None) -> None:
+    __slots__ = ('value', 'is_statement')
+    type = NodeType.IntegerLiteral
+
+    def __init__(self, value: int = None, is_statement: bool = False) -> None:
         self.value: int = value
-    
-    def type(self) -> NodeType:
-        return NodeType.IntegerLiteral
-    
-    def json(self) -> dict:
-        return {
-            "type": self.type().value,
-            "value": self.value
-        }
-    
+        self.is_statement: bool = is_statement
+
 class FloatLiteral(Expression):
-    def __init__(self, value: float = None) -> None:
+    __slots__ = ('value', 'is_statement')
+    type = NodeType.FloatLiteral
+
+    def __init__(self, value: float = None, is_statement: bool = False) -> None:
         self.value: float = value
-    
-    def type(self) -> NodeType:
-        return NodeType.FloatLiteral
-    
-    def json(self) -> dict:
-        return {
-            "type": self.type().value,
-            "value": self.value
-        }
+        self.is_statement: bool = is_statement
+# endregion
+
+# region Serializer
+# Each encoder fills in the fields of `data` in a fixed order, and queues up any child nodes
+# as (node, container, key) so the child's output gets written into container[key] later on
+def _encode_program(node: Program, data: dict, worklist: deque) -> None:
+    data["statements"] = []
+    for stmt in node.statements:
+        wrapper: dict = {}
+        data["statements"].append(wrapper)
+        worklist.append((stmt, wrapper, stmt.type.value))
+
+def _encode_expression_statement(node: ExpressionStatement, data: dict, worklist: deque) -> None:
+    data["expr"] = None
+    worklist.append((node.expr, data, "expr"))
+
+def _encode_infix_expression(node: InfixExpression, data: dict, worklist: deque) -> None:
+    data["left_node"] = None
+    data["operator"] = node.operator
+    data["right_node"] = None
+    worklist.append((node.left_node, data, "left_node"))
+    worklist.append((node.right_node, data, "right_node"))
+
+def _encode_literal(node: IntegerLiteral | FloatLiteral, data: dict, worklist: deque) -> None:
+    data["value"] = node.value
+
+    # Only bare literal statements get the flag, so operand literals serialize exactly as before
+    if node.is_statement:
+        data["is_statement"] = True
+
+ENCODERS: dict[NodeType, Callable[[Node, dict, deque], None]] = {
+    NodeType.Program: _encode_program,
+    NodeType.ExpressionStatement: _encode_expression_statement,
+    NodeType.InfixExpression: _encode_infix_expression,
+    NodeType.IntegerLiteral: _encode_literal,
+    NodeType.FloatLiteral: _encode_literal
+}
+
+def to_json(root: Node) -> dict:
+    """ Walks the AST with a worklist instead of recursion and returns back its JSON representation """
+    output: dict = {}
+    worklist: deque[tuple[Node, dict, str]] = deque([(root, output, "root")])
+
+    while worklist:
+        node, container, key = worklist.popleft()
+
+        data: dict = {"type": node.type.value}
+        container[key] = data
+
+        ENCODERS[node.type](node, data, worklist)
+
+    return output["root"]
 # endregion
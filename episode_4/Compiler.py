@@ -1,9 +1,18 @@
 from llvmlite import ir
+from typing import Callable
 
 from AST import Node, NodeType, Program, Expression, Statement
 from AST import ExpressionStatement, InfixExpression
 from AST import IntegerLiteral, FloatLiteral
 
+# Small integer tags for the llvmlite types, used to key the operator table
+INT_TAG: int = 0
+FLOAT_TAG: int = 1
+TYPE_TAGS: dict[type, int] = {
+    ir.IntType: INT_TAG,
+    ir.FloatType: FLOAT_TAG
+}
+
 class Compiler:
     def __init__(self) -> None:
         self.type_map: dict[str, ir.Type] = {
@@ -20,13 +29,29 @@ class Compiler:
         # Counter for unique block names
         self.counter: int = 0
 
+        # Maps (type tag, operator) to the IRBuilder method that emits it
+        # TODO: Implement '^' (Having an issue off camera implementing this)
+        self.op_table: dict[tuple[int, str], Callable] = {
+            (INT_TAG, '+'): ir.IRBuilder.add,
+            (INT_TAG, '-'): ir.IRBuilder.sub,
+            (INT_TAG, '*'): ir.IRBuilder.mul,
+            (INT_TAG, '/'): ir.IRBuilder.sdiv,
+            (INT_TAG, '%'): ir.IRBuilder.srem,
+
+            (FLOAT_TAG, '+'): ir.IRBuilder.fadd,
+            (FLOAT_TAG, '-'): ir.IRBuilder.fsub,
+            (FLOAT_TAG, '*'): ir.IRBuilder.fmul,
+            (FLOAT_TAG, '/'): ir.IRBuilder.fdiv,
+            (FLOAT_TAG, '%'): ir.IRBuilder.frem
+        }
+
     def __increment_counter(self) -> int:
         self.counter += 1
         return self.counter
 
     def compile(self, node: Node) -> None:
         """ Main Recursive loop for compiling the AST """
-        match node.type():
+        match node.type:
             case NodeType.Program:
                 self.__visit_program(node)
 
@@ -38,6 +63,11 @@ class Compiler:
             case NodeType.InfixExpression:
                 self.__visit_infix_expression(node)
 
+            # Literals
+            case NodeType.IntegerLiteral | NodeType.FloatLiteral:
+                # A literal on its own as a statement has no side effects, so there's nothing to emit
+                pass
+
     # region Visit Methods
     def __visit_program(self, node: Program) -> None:
         """ Generates the main function, then compiles code into it """
@@ -75,38 +105,12 @@ class Compiler:
 
         value = None
         Type = None
-        if isinstance(right_type, ir.IntType) and isinstance(left_type, ir.IntType):
-            Type = self.type_map['int']
-            match operator:
-                case '+':
-                    value = self.builder.add(left_value, right_value)
-                case '-':
-                    value = self.builder.sub(left_value, right_value)
-                case '*':
-                    value = self.builder.mul(left_value, right_value)
-                case '/':
-                    value = self.builder.sdiv(left_value, right_value)
-                case '%':
-                    value = self.builder.srem(left_value, right_value)
-                case '^':
-                    # TODO: Implement this (Having an issue off camera implementing this)
-                    pass
-        elif isinstance(right_type, ir.FloatType) and isinstance(left_type, ir.FloatType):
-            Type = ir.FloatType()
-            match operator:
-                case '+':
-                    value = self.builder.fadd(left_value, right_value)
-                case '-':
-                    value = self.builder.fsub(left_value, right_value)
-                case '*':
-                    value = self.builder.fmul(left_value, right_value)
-                case '/':
-                    value = self.builder.fdiv(left_value, right_value)
-                case '%':
-                    value = self.builder.frem(left_value, right_value)
-                case '^':
-                    # TODO: Implement this (Having an issue off camera implementing this)
-                    pass
+        left_tag: int | None = TYPE_TAGS.get(type(left_type))
+        if left_tag is not None and left_tag == TYPE_TAGS.get(type(right_type)):
+            Type = left_type
+            op_fn: Callable | None = self.op_table.get((left_tag, operator))
+            if op_fn is not None:
+                value = op_fn(self.builder, left_value, right_value)
 
         return value, Type
     # endregion
@@ -116,7 +120,7 @@ class Compiler:
     # region Helper Methods
     def __resolve_value(self, node: Expression, value_type: str = None) -> tuple[ir.Value, ir.Type]:
         """ Resolves a value and returns a tuple (ir_value, ir_type) """
-        match node.type():
+        match node.type:
             # Literals
             case NodeType.IntegerLiteral:
                 node: IntegerLiteral = node
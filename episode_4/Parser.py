@@ -3,7 +3,7 @@ from Token import Token, TokenType
 from typing import Callable
 from enum import Enum, auto
 
-from AST import Statement, Expression, Program
+from AST import NodeType, Statement, Expression, Program
 from AST import ExpressionStatement
 from AST import InfixExpression
 from AST import IntegerLiteral, FloatLiteral
@@ -100,7 +100,7 @@ class Parser:
         program: Program = Program()
 
         while self.current_token.type != TokenType.EOF:
-            stmt: Statement = self.__parse_statement()
+            stmt: Statement | Expression = self.__parse_statement()
             if stmt is not None:
                 program.statements.append(stmt)
             
@@ -109,15 +109,20 @@ class Parser:
         return program
 
     # region Statament Methods
-    def __parse_statement(self) -> Statement:
+    def __parse_statement(self) -> Statement | Expression:
         return self.__parse_expression_statement()
     
-    def __parse_expression_statement(self) -> ExpressionStatement:
+    def __parse_expression_statement(self) -> ExpressionStatement | Expression:
         expr = self.__parse_expression(PrecedenceType.P_LOWEST)
 
         if self.__peek_token_is(TokenType.SEMICOLON):
             self.__next_token()
 
+        # A bare literal doesn't need an ExpressionStatement wrapped around it
+        if expr is not None and expr.type in (NodeType.IntegerLiteral, NodeType.FloatLiteral):
+            expr.is_statement = True
+            return expr
+
         stmt: ExpressionStatement = ExpressionStatement(expr=expr)
 
         return stmt
@@ -18,6 +18,8 @@ class NodeType(Enum):
 
 
 class Node(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def type(self) -> NodeType:
         """ Returns back the NodeType """
@@ -30,13 +32,15 @@ class Node(ABC):
 
 
 class Statement(Node):
-    pass
+    __slots__ = ()
 
 class Expression(Node):
-    pass
+    __slots__ = ()
 
 class Program(Node):
     """ The root node for the AST """
+    __slots__ = ('statements',)
+
     def __init__(self) -> None:
         self.statements: list[Statement] = []
 
@@ -51,8 +55,10 @@ class Program(Node):
 
 # region Statements
 class ExpressionStatement(Statement):
-    def __init__(self, expr: Expression = None) -> None:
-        self.expr: Expression = expr
+    __slots__ = ('expr',)
+
+    def __init__(self, expr: Expression | None = None) -> None:
+        self.expr: Expression | None = expr
 
     def type(self) -> NodeType:
         return NodeType.ExpressionStatement
@@ -60,11 +66,13 @@ class ExpressionStatement(Statement):
     def json(self) -> dict:
         return {
             "type": self.type().value,
-            "expr": self.expr.json()
+            "expr": self.expr.json() if self.expr is not None else None
         }
     
 class LetStatement(Statement):
-    def __init__(self, name: Expression = None, value: Expression = None, value_type: str = None) -> None:
+    __slots__ = ('name', 'value', 'value_type')
+
+    def __init__(self, name: Expression | None = None, value: Expression | None = None, value_type: str | None = None) -> None:
         self.name = name
         self.value = value
         self.value_type = value_type
@@ -75,18 +83,20 @@ class LetStatement(Statement):
     def json(self) -> dict:
         return {
             "type": self.type().value,
-            "name": self.name.json(),
-            "value": self.value.json(),
+            "name": self.name.json() if self.name is not None else None,
+            "value": self.value.json() if self.value is not None else None,
             "value_type": self.value_type
         }
 # endregion
     
 # region Expressions
 class InfixExpression(Expression):
-    def __init__(self, left_node: Expression, operator: str, right_node: Expression = None):
-        self.left_node: Expression = left_node
+    __slots__ = ('left_node', 'operator', 'right_node')
+
+    def __init__(self, left_node: Expression | None, operator: str, right_node: Expression | None = None) -> None:
+        self.left_node: Expression | None = left_node
         self.operator: str = operator
-        self.right_node: Expression = right_node
+        self.right_node: Expression | None = right_node
 
     def type(self) -> NodeType:
         return NodeType.InfixExpression
@@ -94,16 +104,18 @@ class InfixExpression(Expression):
     def json(self) -> dict:
         return {
             "type": self.type().value,
-            "left_node": self.left_node.json(),
+            "left_node": self.left_node.json() if self.left_node is not None else None,
             "operator": self.operator,
-            "right_node": self.right_node.json()
+            "right_node": self.right_node.json() if self.right_node is not None else None
         }
 # endregion
 
 # region Literals
 class IntegerLiteral(Expression):
-    def __init__(self, value: int = None) -> None:
-        self.value: int = value
+    __slots__ = ('value',)
+
+    def __init__(self, value: int | None = None) -> None:
+        self.value: int | None = value
     
     def type(self) -> NodeType:
         return NodeType.IntegerLiteral
@@ -115,8 +127,10 @@ class IntegerLiteral(Expression):
         }
     
 class FloatLiteral(Expression):
-    def __init__(self, value: float = None) -> None:
-        self.value: float = value
+    __slots__ = ('value',)
+
+    def __init__(self, value: float | None = None) -> None:
+        self.value: float | None = value
     
     def type(self) -> NodeType:
         return NodeType.FloatLiteral
@@ -128,8 +142,10 @@ class FloatLiteral(Expression):
         }
     
 class IdentifierLiteral(Expression):
-    def __init__(self, value: str = None) -> None:
-        self.value: str = value
+    __slots__ = ('value',)
+
+    def __init__(self, value: str | None = None) -> None:
+        self.value: str | None = value
     
     def type(self) -> NodeType:
         return NodeType.IdentifierLiteral
@@ -56,7 +56,7 @@ class Lexer:
         dot_count: int = 0
 
         output: str = ""
-        while self.__is_digit(self.current_char) or self.current_char == '.':
+        while self.current_char is not None and (self.__is_digit(self.current_char) or self.current_char == '.'):
             if self.current_char == '.':
                 dot_count += 1
             
@@ -82,11 +82,11 @@ class Lexer:
         
         return self.source[position:self.position]
     
-    def next_token(self) -> list[Token]:
+    def next_token(self) -> Token:
         """
             Main function for executing the Lexer
         """
-        tok: Token = None
+        tok: Token
 
         # Skip the whitespace and ignored characters
         self.__skip_whitespace()
@@ -1,7 +1,8 @@
 from Lexer import Lexer
 from Token import Token, TokenType
-from typing import Callable
+import sys
 from enum import Enum, auto
+from typing import Final
 
 from AST import Statement, Expression, Program
 from AST import ExpressionStatement, LetStatement
@@ -21,7 +22,7 @@ class PrecedenceType(Enum):
     P_INDEX = auto()
 
 # Precedence Mapping
-PRECEDENCES: dict[TokenType, int] = {
+PRECEDENCES: Final[dict[TokenType, PrecedenceType]] = {
     TokenType.PLUS: PrecedenceType.P_SUM,
     TokenType.MINUS: PrecedenceType.P_SUM,
     TokenType.SLASH: PrecedenceType.P_PRODUCT,
@@ -37,26 +38,9 @@ class Parser:
         # Just a list of errors caught during parsing
         self.errors: list[str] = []
 
-        self.current_token: Token = None
-        self.peek_token: Token = None
-
-        self.prefix_parse_fns: dict[TokenType, Callable] = {
-            TokenType.INT: self.__parse_int_literal,
-            TokenType.FLOAT: self.__parse_float_literal,
-            TokenType.LPAREN: self.__parse_grouped_expression
-        }
-        self.infix_parse_fns: dict[TokenType, Callable] = {
-            TokenType.PLUS: self.__parse_infix_expression,
-            TokenType.MINUS: self.__parse_infix_expression,
-            TokenType.SLASH: self.__parse_infix_expression,
-            TokenType.ASTERISK: self.__parse_infix_expression,
-            TokenType.POW: self.__parse_infix_expression,
-            TokenType.MODULUS: self.__parse_infix_expression,
-        }
-
         # Populate the current_token and peek_token
-        self.__next_token()
-        self.__next_token()
+        self.current_token: Token = self.lexer.next_token()
+        self.peek_token: Token = self.lexer.next_token()
     
     # region Parser Helpers
     def __next_token(self) -> None:
@@ -80,13 +64,13 @@ class Parser:
             return False
     
     def __current_precedence(self) -> PrecedenceType:
-        prec: int | None = PRECEDENCES.get(self.current_token.type)
+        prec: PrecedenceType | None = PRECEDENCES.get(self.current_token.type)
         if prec is None:
             return PrecedenceType.P_LOWEST
         return prec
     
     def __peek_precedence(self) -> PrecedenceType:
-        prec: int | None = PRECEDENCES.get(self.peek_token.type)
+        prec: PrecedenceType | None = PRECEDENCES.get(self.peek_token.type)
         if prec is None:
             return PrecedenceType.P_LOWEST
         return prec
@@ -94,25 +78,28 @@ class Parser:
     def __peek_error(self, tt: TokenType) -> None:
         self.errors.append(f"Expected next token to be {tt}, got {self.peek_token.type} instead.")
 
-    def __no_prefix_parse_fn_error(self, tt: TokenType):
+    def __no_prefix_parse_fn_error(self, tt: TokenType) -> None:
         self.errors.append(f"No Prefix Parse Function for {tt} found")
     # endregion
     
-    def parse_program(self) -> None:
+    def parse_program(self) -> Program:
         """ Main execution entry to the Parser """
         program: Program = Program()
 
+        # Bound once up front instead of looking up program.statements.append for every statement
+        add_statement = program.statements.append
+
         while self.current_token.type != TokenType.EOF:
-            stmt: Statement = self.__parse_statement()
+            stmt: Statement | None = self.__parse_statement()
             if stmt is not None:
-                program.statements.append(stmt)
+                add_statement(stmt)
             
             self.__next_token()
 
         return program
 
     # region Statament Methods
-    def __parse_statement(self) -> Statement:
+    def __parse_statement(self) -> Statement | None:
         match self.current_token.type:
             case TokenType.LET:
                 return self.__parse_let_statement()
@@ -129,7 +116,7 @@ class Parser:
 
         return stmt
     
-    def __parse_let_statement(self) -> LetStatement:
+    def __parse_let_statement(self) -> LetStatement | None:
         stmt: LetStatement = LetStatement()
 
         # let a: int = 10;
@@ -145,7 +132,7 @@ class Parser:
         if not self.__expect_peek(TokenType.TYPE):
             return None
         
-        stmt.value_type = self.current_token.literal
+        stmt.value_type = sys.intern(self.current_token.literal)
 
         if not self.__expect_peek(TokenType.EQ):
             return None
@@ -161,27 +148,35 @@ class Parser:
     # endregion
 
     # region Expression Methods
-    def __parse_expression(self, precedence: PrecedenceType) -> Expression:
-        prefix_fn: Callable | None = self.prefix_parse_fns.get(self.current_token.type)
-        if prefix_fn is None:
-            self.__no_prefix_parse_fn_error(self.current_token.type)
-            return None
-        
-        left_expr: Expression = prefix_fn()
+    def __parse_expression(self, precedence: PrecedenceType) -> Expression | None:
+        # Prefix and infix parsing are dispatched with plain match blocks rather than dicts of bound methods,
+        # which keeps every call site direct (and easy for PyPy's tracing JIT to inline)
+        match self.current_token.type:
+            case TokenType.INT:
+                left_expr: Expression | None = self.__parse_int_literal()
+            case TokenType.FLOAT:
+                left_expr = self.__parse_float_literal()
+            case TokenType.LPAREN:
+                left_expr = self.__parse_grouped_expression()
+            case _:
+                self.__no_prefix_parse_fn_error(self.current_token.type)
+                return None
+
         while not self.__peek_token_is(TokenType.SEMICOLON) and precedence.value < self.__peek_precedence().value:
-            infix_fn: Callable | None = self.infix_parse_fns.get(self.peek_token.type)
-            if infix_fn is None:
-                return left_expr
-            
-            self.__next_token()
+            match self.peek_token.type:
+                case TokenType.PLUS | TokenType.MINUS | TokenType.SLASH | TokenType.ASTERISK | TokenType.POW | TokenType.MODULUS:
+                    self.__next_token()
 
-            left_expr = infix_fn(left_expr)
+                    left_expr = self.__parse_infix_expression(left_expr)
+                case _:
+                    return left_expr
         
         return left_expr
     
-    def __parse_infix_expression(self, left_node: Expression) -> Expression:
+    def __parse_infix_expression(self, left_node: Expression | None) -> InfixExpression:
         """ Parses and returns a normal InfixExpression """
-        infix_expr: InfixExpression = InfixExpression(left_node=left_node, operator=self.current_token.literal)
+        # Operators and type names are interned so the Compiler's comparisons and dict lookups on them stay cheap
+        infix_expr: InfixExpression = InfixExpression(left_node=left_node, operator=sys.intern(self.current_token.literal))
 
         precedence = self.__current_precedence()
 
@@ -191,10 +186,10 @@ class Parser:
 
         return infix_expr
     
-    def __parse_grouped_expression(self) -> Expression:
+    def __parse_grouped_expression(self) -> Expression | None:
         self.__next_token()
 
-        expr: Expression = self.__parse_expression(PrecedenceType.P_LOWEST)
+        expr: Expression | None = self.__parse_expression(PrecedenceType.P_LOWEST)
 
         if not self.__expect_peek(TokenType.RPAREN):
             return None
@@ -203,27 +198,13 @@ class Parser:
     # endregion
 
     # region Prefix Methods
-    def __parse_int_literal(self) -> Expression:
+    def __parse_int_literal(self) -> IntegerLiteral:
         """ Parses an IntegerLiteral Node from the current token """
-        int_lit: IntegerLiteral = IntegerLiteral()
-
-        try:
-            int_lit.value = int(self.current_token.literal)
-        except:
-            self.errors.append(f"Could not parse `{self.current_token.literal}` as an integer.")
-            return None
-        
-        return int_lit
+        # The Lexer has already classified (and converted) this token as an INT, so there's nothing left that can fail here
+        return IntegerLiteral(value=int(self.current_token.literal))
     
-    def __parse_float_literal(self) -> Expression:
+    def __parse_float_literal(self) -> FloatLiteral:
         """ Parses an FloatLiteral Node from the current token """
-        float_lit: FloatLiteral = FloatLiteral()
-
-        try:
-            float_lit.value = float(self.current_token.literal)
-        except:
-            self.errors.append(f"Could not parse `{self.current_token.literal}` as an float.")
-            return None
-        
-        return float_lit
+        # Same as above, the Lexer only hands out FLOAT tokens for valid floats
+        return FloatLiteral(value=float(self.current_token.literal))
     # endregion
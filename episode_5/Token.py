@@ -36,6 +36,8 @@ class TokenType(Enum):
 
 
 class Token:
+    __slots__ = ('type', 'literal', 'line_no', 'position')
+
     def __init__(self, type: TokenType, literal: Any, line_no: int, position: int) -> None:
         self.type = type
         self.literal = literal
@@ -66,7 +68,7 @@ def lookup_ident(ident: str) -> TokenType:
     if tt is not None:
         return tt
     
-    tt: TokenType | None = ALT_KEYWORDS.get(ident)
+    tt = ALT_KEYWORDS.get(ident)
     if tt is not None:
         return tt
     
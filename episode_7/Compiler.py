@@ -1,4 +1,5 @@
 from llvmlite import ir
+from typing import Callable
 
 from AST import Node, NodeType, Program, Expression
 from AST import ExpressionStatement, LetStatement, FunctionStatement, ReturnStatement, BlockStatement, AssignStatement
@@ -20,6 +21,9 @@ class Compiler:
         # Current Builder
         self.builder: ir.IRBuilder = ir.IRBuilder()
 
+        # Builder pinned to the start of the current function's entry block, where every alloca is emitted
+        self.entry_builder: ir.IRBuilder = ir.IRBuilder()
+
         # Counter for unique block names
         self.counter: int = 0
 
@@ -29,33 +33,44 @@ class Compiler:
         # Temporary keeping track of errors
         self.errors: list[str] = []
 
+        # Literal constants already built, so repeated literals (0, 1, ...) reuse the same ir.Constant
+        self.int_const_cache: dict[int, ir.Constant] = {}
+        self.float_const_cache: dict[float, ir.Constant] = {}
+
+        # Visit method dispatch tables, built once so compile() doesn't have to re-match the NodeType on every node
+        self.compile_fns: dict[NodeType, Callable[[Node], None]] = {
+            NodeType.Program: self.__visit_program,
+
+            # Statements
+            NodeType.ExpressionStatement: self.__visit_expression_statement,
+            NodeType.LetStatement: self.__visit_let_statement,
+            NodeType.FunctionStatement: self.__visit_function_statement,
+            NodeType.BlockStatement: self.__visit_block_statement,
+            NodeType.ReturnStatement: self.__visit_return_statement,
+            NodeType.AssignStatement: self.__visit_assign_statement,
+
+            # Expressions
+            NodeType.InfixExpression: self.__visit_infix_expression
+        }
+        self.resolve_fns: dict[NodeType, Callable[[Expression], tuple[ir.Value, ir.Type]]] = {
+            # Literals
+            NodeType.IntegerLiteral: self.__resolve_integer_literal,
+            NodeType.FloatLiteral: self.__resolve_float_literal,
+            NodeType.IdentifierLiteral: self.__resolve_identifier_literal,
+
+            # Expression Values
+            NodeType.InfixExpression: self.__visit_infix_expression
+        }
+
     def __increment_counter(self) -> int:
         self.counter += 1
         return self.counter
 
     def compile(self, node: Node) -> None:
         """ Main Recursive loop for compiling the AST """
-        match node.type():
-            case NodeType.Program:
-                self.__visit_program(node)
-
-            # Statements
-            case NodeType.ExpressionStatement:
-                self.__visit_expression_statement(node)
-            case NodeType.LetStatement:
-                self.__visit_let_statement(node)
-            case NodeType.FunctionStatement:
-                self.__visit_function_statement(node)
-            case NodeType.BlockStatement:
-                self.__visit_block_statement(node)
-            case NodeType.ReturnStatement:
-                self.__visit_return_statement(node)
-            case NodeType.AssignStatement:
-                self.__visit_assign_statement(node)
-
-            # Expressions
-            case NodeType.InfixExpression:
-                self.__visit_infix_expression(node)
+        compile_fn: Callable | None = self.compile_fns.get(node.type())
+        if compile_fn is not None:
+            compile_fn(node)
 
     # region Visit Methods
     def __visit_program(self, node: Program) -> None:
@@ -74,18 +89,25 @@ class Compiler:
 
         value, Type = self.__resolve_value(node=value)
 
-        if self.env.lookup(name) is None:
-            # Define and allocate the variable
-            ptr = self.builder.alloca(Type)
+        b: ir.IRBuilder = self.builder
+
+        # Look the name up once and reuse the result, rather than searching the Environment twice
+        entry: tuple[ir.Value, ir.Type] | None = self.env.lookup(name)
+        if entry is None:
+            # Define and allocate the variable up in the entry block, so mem2reg can promote it later on
+            ptr = self.entry_builder.alloca(Type, name=name)
+
+            # Inserting above the current builder shifts its position within the block, so move it back to the end
+            b.position_at_end(b.block)
 
             # Storing the value to the pointer
-            self.builder.store(value, ptr)
+            b.store(value, ptr)
 
             # Add the variable to the environment
             self.env.define(name, ptr, Type)
         else:
-            ptr, _ = self.env.lookup(name)
-            self.builder.store(value, ptr)
+            ptr, _ = entry
+            b.store(value, ptr)
 
     def __visit_block_statement(self, node: BlockStatement) -> None:
         for stmt in node.statements:
@@ -116,9 +138,13 @@ class Compiler:
         block: ir.Block = func.append_basic_block(f'{name}_entry')
 
         previous_builder = self.builder
+        previous_entry_builder = self.entry_builder
 
         self.builder = ir.IRBuilder(block)
 
+        self.entry_builder = ir.IRBuilder(block)
+        self.entry_builder.position_at_start(block)
+
         previous_env = self.env
 
         self.env = Environment(parent=self.env)
@@ -130,6 +156,7 @@ class Compiler:
         self.env.define(name, func, return_type)
 
         self.builder = previous_builder
+        self.entry_builder = previous_entry_builder
 
     def __visit_assign_statement(self, node: AssignStatement) -> None:
         name: str = node.ident.value
@@ -137,10 +164,11 @@ class Compiler:
 
         value, Type = self.__resolve_value(value)
 
-        if self.env.lookup(name) is None:
+        entry: tuple[ir.Value, ir.Type] | None = self.env.lookup(name)
+        if entry is None:
             self.errors.append(f"COMPILE ERROR: Identifier {name} has not been declared before it was re-assigned.")
         else:
-            ptr, _ = self.env.lookup(name)
+            ptr, _ = entry
             self.builder.store(value, ptr)
     # endregion
         
@@ -150,21 +178,24 @@ class Compiler:
         left_value, left_type = self.__resolve_value(node.left_node)
         right_value, right_type = self.__resolve_value(node.right_node)
 
+        # Look the builder up once, rather than once per emitted instruction
+        b: ir.IRBuilder = self.builder
+
         value = None
         Type = None
         if isinstance(right_type, ir.IntType) and isinstance(left_type, ir.IntType):
             Type = self.type_map['int']
             match operator:
                 case '+':
-                    value = self.builder.add(left_value, right_value)
+                    value = b.add(left_value, right_value)
                 case '-':
-                    value = self.builder.sub(left_value, right_value)
+                    value = b.sub(left_value, right_value)
                 case '*':
-                    value = self.builder.mul(left_value, right_value)
+                    value = b.mul(left_value, right_value)
                 case '/':
-                    value = self.builder.sdiv(left_value, right_value)
+                    value = b.sdiv(left_value, right_value)
                 case '%':
-                    value = self.builder.srem(left_value, right_value)
+                    value = b.srem(left_value, right_value)
                 case '^':
                     # TODO: Implement this (Having an issue off camera implementing this)
                     pass
@@ -172,15 +203,15 @@ class Compiler:
             Type = ir.FloatType()
             match operator:
                 case '+':
-                    value = self.builder.fadd(left_value, right_value)
+                    value = b.fadd(left_value, right_value)
                 case '-':
-                    value = self.builder.fsub(left_value, right_value)
+                    value = b.fsub(left_value, right_value)
                 case '*':
-                    value = self.builder.fmul(left_value, right_value)
+                    value = b.fmul(left_value, right_value)
                 case '/':
-                    value = self.builder.fdiv(left_value, right_value)
+                    value = b.fdiv(left_value, right_value)
                 case '%':
-                    value = self.builder.frem(left_value, right_value)
+                    value = b.frem(left_value, right_value)
                 case '^':
                     # TODO: Implement this (Having an issue off camera implementing this)
                     pass
@@ -193,23 +224,35 @@ class Compiler:
     # region Helper Methods
     def __resolve_value(self, node: Expression) -> tuple[ir.Value, ir.Type]:
         """ Resolves a value and returns a tuple (ir_value, ir_type) """
-        match node.type():
-            # Literals
-            case NodeType.IntegerLiteral:
-                node: IntegerLiteral = node
-                value, Type = node.value, self.type_map['int']
-                return ir.Constant(Type, value), Type
-            case NodeType.FloatLiteral:
-                node: FloatLiteral = node
-                value, Type = node.value, self.type_map['float']
-                return ir.Constant(Type, value), Type
-            case NodeType.IdentifierLiteral:
-                node: IdentifierLiteral = node
-                ptr, Type = self.env.lookup(node.value)
-                return self.builder.load(ptr), Type
-            
-            # Expression Values
-            case NodeType.InfixExpression:
-                return self.__visit_infix_expression(node)
+        resolve_fn: Callable | None = self.resolve_fns.get(node.type())
+        if resolve_fn is not None:
+            return resolve_fn(node)
+
+    def __resolve_integer_literal(self, node: IntegerLiteral) -> tuple[ir.Value, ir.Type]:
+        value, Type = node.value, self.type_map['int']
+
+        const: ir.Constant | None = self.int_const_cache.get(value)
+        if const is None:
+            const = ir.Constant(Type, value)
+            self.int_const_cache[value] = const
+
+        return const, Type
+
+    def __resolve_float_literal(self, node: FloatLiteral) -> tuple[ir.Value, ir.Type]:
+        value, Type = node.value, self.type_map['float']
+
+        # NaN never compares equal to itself, so it can't be used as a cache key
+        if value != value:
+            return ir.Constant(Type, value), Type
+
+        const: ir.Constant | None = self.float_const_cache.get(value)
+        if const is None:
+            const = ir.Constant(Type, value)
+            self.float_const_cache[value] = const
+
+        return const, Type
+
+    def __resolve_identifier_literal(self, node: IdentifierLiteral) -> tuple[ir.Value, ir.Type]:
+        ptr, Type = self.env.lookup(node.value)
+        return self.builder.load(ptr), Type
     # endregion
-    
\ No newline at end of file
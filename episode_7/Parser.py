@@ -1,7 +1,6 @@
 from Lexer import Lexer
 from Token import Token, TokenType
-from typing import Callable
-from enum import Enum, auto
+from enum import IntEnum, auto
 
 from AST import Statement, Expression, Program
 from AST import ExpressionStatement, LetStatement, FunctionStatement, ReturnStatement, BlockStatement, AssignStatement
@@ -9,7 +8,7 @@ from AST import InfixExpression
 from AST import IntegerLiteral, FloatLiteral, IdentifierLiteral
 
 # Precedence Types
-class PrecedenceType(Enum):
+class PrecedenceType(IntEnum):
     P_LOWEST = 0
     P_EQUALS = auto()
     P_LESSGREATER = auto()
@@ -21,7 +20,7 @@ class PrecedenceType(Enum):
     P_INDEX = auto()
 
 # Precedence Mapping
-PRECEDENCES: dict[TokenType, int] = {
+PRECEDENCES: dict[TokenType, PrecedenceType] = {
     TokenType.PLUS: PrecedenceType.P_SUM,
     TokenType.MINUS: PrecedenceType.P_SUM,
     TokenType.SLASH: PrecedenceType.P_PRODUCT,
@@ -30,6 +29,11 @@ PRECEDENCES: dict[TokenType, int] = {
     TokenType.POW: PrecedenceType.P_EXPONENT,
 }
 
+# PRECEDENCES flattened into a tuple indexed by TokenType, with P_LOWEST for every non-operator
+PRECEDENCE_TABLE: tuple[PrecedenceType, ...] = tuple(
+    PRECEDENCES.get(tt, PrecedenceType.P_LOWEST) for tt in range(max(TokenType) + 1)
+)
+
 class Parser:
     def __init__(self, lexer: Lexer) -> None:
         self.lexer: Lexer = lexer
@@ -40,22 +44,6 @@ class Parser:
         self.current_token: Token = None
         self.peek_token: Token = None
 
-        self.prefix_parse_fns: dict[TokenType, Callable] = {
-            TokenType.IDENT: self.__parse_identifier,
-            TokenType.INT: self.__parse_int_literal,
-            TokenType.FLOAT: self.__parse_float_literal,
-            TokenType.LPAREN: self.__parse_grouped_expression
-        }
-        self.infix_parse_fns: dict[TokenType, Callable] = {
-            TokenType.PLUS: self.__parse_infix_expression,
-            TokenType.MINUS: self.__parse_infix_expression,
-            TokenType.SLASH: self.__parse_infix_expression,
-            TokenType.ASTERISK: self.__parse_infix_expression,
-            TokenType.POW: self.__parse_infix_expression,
-            TokenType.MODULUS: self.__parse_infix_expression,
-            TokenType.EQ: self.__parse_infix_expression
-        }
-
         # Populate the current_token and peek_token
         self.__next_token()
         self.__next_token()
@@ -82,16 +70,10 @@ class Parser:
             return False
     
     def __current_precedence(self) -> PrecedenceType:
-        prec: int | None = PRECEDENCES.get(self.current_token.type)
-        if prec is None:
-            return PrecedenceType.P_LOWEST
-        return prec
+        return PRECEDENCE_TABLE[self.current_token.type]
     
     def __peek_precedence(self) -> PrecedenceType:
-        prec: int | None = PRECEDENCES.get(self.peek_token.type)
-        if prec is None:
-            return PrecedenceType.P_LOWEST
-        return prec
+        return PRECEDENCE_TABLE[self.peek_token.type]
     
     def __peek_error(self, tt: TokenType) -> None:
         self.errors.append(f"Expected next token to be {tt}, got {self.peek_token.type} instead.")
@@ -242,20 +224,28 @@ class Parser:
 
     # region Expression Methods
     def __parse_expression(self, precedence: PrecedenceType) -> Expression:
-        prefix_fn: Callable | None = self.prefix_parse_fns.get(self.current_token.type)
-        if prefix_fn is None:
-            self.__no_prefix_parse_fn_error(self.current_token.type)
-            return None
-        
-        left_expr: Expression = prefix_fn()
-        while not self.__peek_token_is(TokenType.SEMICOLON) and precedence.value < self.__peek_precedence().value:
-            infix_fn: Callable | None = self.infix_parse_fns.get(self.peek_token.type)
-            if infix_fn is None:
-                return left_expr
-            
-            self.__next_token()
+        tt: TokenType = self.current_token.type
+        match tt:
+            case TokenType.IDENT:
+                left_expr: Expression = self.__parse_identifier()
+            case TokenType.INT:
+                left_expr = self.__parse_int_literal()
+            case TokenType.FLOAT:
+                left_expr = self.__parse_float_literal()
+            case TokenType.LPAREN:
+                left_expr = self.__parse_grouped_expression()
+            case _:
+                self.__no_prefix_parse_fn_error(tt)
+                return None
+
+        while not self.__peek_token_is(TokenType.SEMICOLON) and precedence < self.__peek_precedence():
+            match self.peek_token.type:
+                case TokenType.PLUS | TokenType.MINUS | TokenType.SLASH | TokenType.ASTERISK | TokenType.POW | TokenType.MODULUS | TokenType.EQ:
+                    self.__next_token()
 
-            left_expr = infix_fn(left_expr)
+                    left_expr = self.__parse_infix_expression(left_expr)
+                case _:
+                    return left_expr
         
         return left_expr
     
@@ -1,43 +1,47 @@
-from enum import Enum
+from enum import Enum, IntEnum, auto
 from typing import Any
 
-class TokenType(Enum):
+class TokenType(IntEnum):
+    # TokenTypes are ints so the Parser can index tables with them directly
+    # Keep printing them as `TokenType.X` rather than the bare int
+    __str__ = Enum.__str__
+
     # Special Tokens
-    EOF = "EOF"
-    ILLEGAL = "ILLEGAL"
+    EOF = auto()
+    ILLEGAL = auto()
 
     # Data Types
-    IDENT = "IDENT"
-    INT = "INT"
-    FLOAT = "FLOAT"
+    IDENT = auto()
+    INT = auto()
+    FLOAT = auto()
 
     # Arithmetic Symbols
-    PLUS = "PLUS"
-    MINUS = "MINUS"
-    ASTERISK = "ASTERISK"
-    SLASH = "SLASH"
-    POW = "POW"
-    MODULUS = "MODULUS"
+    PLUS = auto()
+    MINUS = auto()
+    ASTERISK = auto()
+    SLASH = auto()
+    POW = auto()
+    MODULUS = auto()
 
     # Assignment Symbols
-    EQ = "EQ"
+    EQ = auto()
 
     # Symbols
-    COLON = "COLON"
-    SEMICOLON = "SEMICOLON"
-    ARROW = "ARROW"
-    LPAREN = "LPAREN"
-    RPAREN = "RPAREN"
-    LBRACE = "LBRACE"
-    RBRACE = "RBRACE"
+    COLON = auto()
+    SEMICOLON = auto()
+    ARROW = auto()
+    LPAREN = auto()
+    RPAREN = auto()
+    LBRACE = auto()
+    RBRACE = auto()
 
     # Keywords
-    LET = "LET"
-    FN = "FN"
-    RETURN = "RETURN"
+    LET = auto()
+    FN = auto()
+    RETURN = auto()
 
     # Typing
-    TYPE = "TYPE"
+    TYPE = auto()
 
 
 class Token:
@@ -1,4 +1,5 @@
 from llvmlite import ir
+from typing import Callable
 
 from AST import Node, NodeType, Program, Expression
 from AST import ExpressionStatement, LetStatement, FunctionStatement, ReturnStatement, BlockStatement, AssignStatement, IfStatement
@@ -10,6 +11,23 @@ from AST import FunctionParameter
 from Environment import Environment
 
 class Compiler:
+    # Operator tables for infix expressions, arithmetic ops map to the (unbound) IRBuilder method that emits them
+    INT_ARITH_OPS: dict[str, Callable] = {
+        '+': ir.IRBuilder.add,
+        '-': ir.IRBuilder.sub,
+        '*': ir.IRBuilder.mul,
+        '/': ir.IRBuilder.sdiv,
+        '%': ir.IRBuilder.srem
+    }
+    FLOAT_ARITH_OPS: dict[str, Callable] = {
+        '+': ir.IRBuilder.fadd,
+        '-': ir.IRBuilder.fsub,
+        '*': ir.IRBuilder.fmul,
+        '/': ir.IRBuilder.fdiv,
+        '%': ir.IRBuilder.frem
+    }
+    COMPARISON_OPS: frozenset[str] = frozenset({'<', '<=', '>', '>=', '=='})
+
     def __init__(self) -> None:
         self.type_map: dict[str, ir.Type] = {
             'int': ir.IntType(32),
@@ -21,6 +39,17 @@ class Compiler:
             'str': ir.PointerType(ir.IntType(8))
         }
 
+        # Shared IR types and constants, so the hot visit methods don't build a new one for every node
+        self.bool_type: ir.Type = self.type_map['bool']
+        self.int_type: ir.Type = self.type_map['int']
+        self.float_type: ir.Type = self.type_map['float']
+        self.true_const: ir.Constant = ir.Constant(self.bool_type, 1)
+        self.false_const: ir.Constant = ir.Constant(self.bool_type, 0)
+
+        # Prebuilt constants for the literals that show up the most (loop counters, offsets, ...), reused instead of reallocated
+        self.int_consts: dict[int, ir.Constant] = {i: ir.Constant(self.int_type, i) for i in range(0, 17)}
+        self.float_consts: dict[float, ir.Constant] = {f: ir.Constant(self.float_type, f) for f in (0.0, 1.0)}
+
         # Initialize the main module
         self.module: ir.Module = ir.Module('main')
 
@@ -33,23 +62,62 @@ class Compiler:
         # Environment reference for the currently compiling scope
         self.env: Environment = Environment()
 
+        # FunctionTypes built so far, keyed by (return_type, param_types)
+        self.function_types: dict[tuple[ir.Type, tuple[ir.Type, ...]], ir.FunctionType] = {}
+
+        # Values already loaded from (or stored to) each variable pointer in the builder's current block, so repeated reads
+        # of a variable reuse the same SSA value instead of emitting another load. Reset whenever the builder moves to a new block
+        self.load_cache: dict[ir.Value, ir.Value] = {}
+        self.load_cache_block: ir.Block | None = None
+
         # Temporary keeping track of errors
         self.errors: list[str] = []
 
+        # Visit method dispatch tables, built once so compile() doesn't have to re-match the NodeType on every node
+        self.compile_fns: dict[NodeType, Callable[[Node], None]] = {
+            NodeType.Program: self.__visit_program,
+
+            # Statements
+            NodeType.ExpressionStatement: self.__visit_expression_statement,
+            NodeType.LetStatement: self.__visit_let_statement,
+            NodeType.FunctionStatement: self.__visit_function_statement,
+            NodeType.BlockStatement: self.__visit_block_statement,
+            NodeType.ReturnStatement: self.__visit_return_statement,
+            NodeType.AssignStatement: self.__visit_assign_statement,
+            NodeType.IfStatement: self.__visit_if_statement,
+            NodeType.WhileStatement: self.__visit_while_statement,
+
+            # Expressions
+            NodeType.InfixExpression: self.__visit_infix_expression,
+            NodeType.CallExpression: self.__visit_call_expression
+        }
+        self.resolve_fns: dict[NodeType, Callable[[Expression], tuple[ir.Value, ir.Type]]] = {
+            # Literals
+            NodeType.IntegerLiteral: self.__resolve_integer_literal,
+            NodeType.FloatLiteral: self.__resolve_float_literal,
+            NodeType.IdentifierLiteral: self.__resolve_identifier_literal,
+            NodeType.BooleanLiteral: self.__resolve_boolean_literal,
+            NodeType.StringLiteral: self.__resolve_string_literal,
+
+            # Expression Values
+            NodeType.InfixExpression: self.__visit_infix_expression,
+            NodeType.CallExpression: self.__visit_call_expression
+        }
+
         # Initialize Builtin functions and values
         self.__initialize_builtins()
 
     def __initialize_builtins(self) -> None:
         def __init_print() -> ir.Function:
             fnty: ir.FunctionType = ir.FunctionType(
-                self.type_map['int'],
+                self.int_type,
                 [ir.IntType(8).as_pointer()],
                 var_arg=True
             )
             return ir.Function(self.module, fnty, 'printf')
         
         def __init_booleans() -> tuple[ir.GlobalVariable, ir.GlobalVariable]:
-            bool_type: ir.Type = self.type_map['bool']
+            bool_type: ir.Type = self.bool_type
 
             true_var = ir.GlobalVariable(self.module, bool_type, 'true')
             true_var.initializer = ir.Constant(bool_type, 1)
@@ -61,7 +129,7 @@ class Compiler:
 
             return true_var, false_var
         
-        self.env.define('printf', __init_print(), ir.IntType(32))
+        self.env.define('printf', __init_print(), self.int_type)
         
         true_var, false_var = __init_booleans()
         self.env.define('true', true_var, true_var.type)
@@ -73,33 +141,9 @@ class Compiler:
 
     def compile(self, node: Node) -> None:
         """ Main Recursive loop for compiling the AST """
-        match node.type():
-            case NodeType.Program:
-                self.__visit_program(node)
-
-            # Statements
-            case NodeType.ExpressionStatement:
-                self.__visit_expression_statement(node)
-            case NodeType.LetStatement:
-                self.__visit_let_statement(node)
-            case NodeType.FunctionStatement:
-                self.__visit_function_statement(node)
-            case NodeType.BlockStatement:
-                self.__visit_block_statement(node)
-            case NodeType.ReturnStatement:
-                self.__visit_return_statement(node)
-            case NodeType.AssignStatement:
-                self.__visit_assign_statement(node)
-            case NodeType.IfStatement:
-                self.__visit_if_statement(node)
-            case NodeType.WhileStatement:
-                self.__visit_while_statement(node)
-
-            # Expressions
-            case NodeType.InfixExpression:
-                self.__visit_infix_expression(node)
-            case NodeType.CallExpression:
-                self.__visit_call_expression(node)
+        compile_fn: Callable | None = self.compile_fns.get(node.type())
+        if compile_fn is not None:
+            compile_fn(node)
 
     # region Visit Methods
     def __visit_program(self, node: Program) -> None:
@@ -118,18 +162,23 @@ class Compiler:
 
         value, Type = self.__resolve_value(node=value)
 
-        if self.env.lookup(name) is None:
+        b: ir.IRBuilder = self.builder
+
+        entry: tuple[ir.Value, ir.Type] | None = self.env.lookup(name)
+        if entry is None:
             # Define and allocate the variable
-            ptr = self.builder.alloca(Type)
+            ptr = b.alloca(Type)
 
             # Storing the value to the pointer
-            self.builder.store(value, ptr)
+            b.store(value, ptr)
 
             # Add the variable to the environment
             self.env.define(name, ptr, Type)
         else:
-            ptr, _ = self.env.lookup(name)
-            self.builder.store(value, ptr)
+            ptr, _ = entry
+            b.store(value, ptr)
+
+        self.__block_load_cache()[ptr] = value
 
     def __visit_block_statement(self, node: BlockStatement) -> None:
         for stmt in node.statements:
@@ -146,15 +195,18 @@ class Compiler:
         body: BlockStatement = node.body
         params: list[FunctionParameter] = node.parameters
 
-        # Keep track of the names of each parameter
-        param_names: list[str] = [p.name for p in params]
-
         # Keep track of the types for each parameter
         param_types: list[ir.Type] = [self.type_map[p.value_type] for p in params]
 
         return_type: ir.Type = self.type_map[node.return_type]
 
-        fnty: ir.FunctionType = ir.FunctionType(return_type, param_types)
+        # Functions with the same signature share one FunctionType
+        signature: tuple[ir.Type, tuple[ir.Type, ...]] = (return_type, tuple(param_types))
+        fnty: ir.FunctionType | None = self.function_types.get(signature)
+        if fnty is None:
+            fnty = ir.FunctionType(return_type, param_types)
+            self.function_types[signature] = fnty
+
         func: ir.Function = ir.Function(self.module, fnty, name=name)
 
         block: ir.Block = func.append_basic_block(f'{name}_entry')
@@ -162,22 +214,16 @@ class Compiler:
         previous_builder = self.builder
 
         self.builder = ir.IRBuilder(block)
+        b: ir.IRBuilder = self.builder
 
-        # Storing the pointers to each parameter
-        params_ptr = []
-        for i, typ in enumerate(param_types):
-            ptr = self.builder.alloca(typ)
-            self.builder.store(func.args[i], ptr)
-            params_ptr.append(ptr)
-
-        # Adding the parameters to the environment
+        # Storing each parameter to a pointer and adding it to the environment
         previous_env = self.env
         self.env = Environment(parent=previous_env)
-        for i, x in enumerate(zip(param_types, param_names)):
-            typ = param_types[i]
-            ptr = params_ptr[i]
+        for p, typ, arg in zip(params, param_types, func.args):
+            ptr = b.alloca(typ)
+            b.store(arg, ptr)
 
-            self.env.define(x[1], ptr, typ)
+            self.env.define(p.name, ptr, typ)
 
         self.env.define(name, func, return_type)
 
@@ -194,11 +240,13 @@ class Compiler:
 
         value, Type = self.__resolve_value(value)
 
-        if self.env.lookup(name) is None:
+        entry: tuple[ir.Value, ir.Type] | None = self.env.lookup(name)
+        if entry is None:
             self.errors.append(f"COMPILE ERROR: Identifier {name} has not been declared before it was re-assigned.")
         else:
-            ptr, _ = self.env.lookup(name)
+            ptr, _ = entry
             self.builder.store(value, ptr)
+            self.__block_load_cache()[ptr] = value
 
     def __visit_if_statement(self, node: IfStatement) -> None:
         condition = node.condition
@@ -232,11 +280,13 @@ class Compiler:
 
         test, _ = self.__resolve_value(condition)
 
+        b: ir.IRBuilder = self.builder
+
         # Entry block that runs if the condition is true
-        while_loop_entry = self.builder.append_basic_block(f"while_loop_entry_{self.__increment_counter()}")
+        while_loop_entry = b.append_basic_block(f"while_loop_entry_{self.__increment_counter()}")
 
         # If the condition is false, it runs from this block
-        while_loop_otherwise = self.builder.append_basic_block(f"while_loop_otherwise_{self.counter}")
+        while_loop_otherwise = b.append_basic_block(f"while_loop_otherwise_{self.counter}")
 
         # Creating a condition branch
         #     condition
@@ -245,91 +295,69 @@ class Compiler:
         #       /   \
         #      /     \
         # true block  false block
-        self.builder.cbranch(test, while_loop_entry, while_loop_otherwise)
+        b.cbranch(test, while_loop_entry, while_loop_otherwise)
 
         # Setting the builder position-at-start
-        self.builder.position_at_start(while_loop_entry)
+        b.position_at_start(while_loop_entry)
 
         # Compile the body of the while statement
         self.compile(body)
 
         test, _ = self.__resolve_value(condition)
 
-        self.builder.cbranch(test, while_loop_entry, while_loop_otherwise)
-        self.builder.position_at_start(while_loop_otherwise)
+        b.cbranch(test, while_loop_entry, while_loop_otherwise)
+        b.position_at_start(while_loop_otherwise)
     # endregion
         
     # region Expressions
-    def __visit_infix_expression(self, node: InfixExpression) -> None:
-        operator: str = node.operator
-        left_value, left_type = self.__resolve_value(node.left_node)
-        right_value, right_type = self.__resolve_value(node.right_node)
+    def __visit_infix_expression(self, node: InfixExpression) -> tuple[ir.Value, ir.Type]:
+        """ Compiles a chain of nested infix expressions with an explicit stack, instead of recursing once per operand """
+        # Post-order walk: an InfixExpression is pushed once to queue up its operands (left on top, so it's compiled first)
+        # and once more to emit its own instruction after both operand values are on the value stack
+        work_stack: list[tuple[bool, Expression]] = [(False, node)]
+        value_stack: list[tuple[ir.Value, ir.Type]] = []
+        while work_stack:
+            operands_done, expr = work_stack.pop()
+            if operands_done:
+                right_value, right_type = value_stack.pop()
+                left_value, left_type = value_stack.pop()
+                value_stack.append(self.__emit_infix(expr.operator, left_value, left_type, right_value, right_type))
+            elif expr.type() == NodeType.InfixExpression:
+                work_stack.append((True, expr))
+                work_stack.append((False, expr.right_node))
+                work_stack.append((False, expr.left_node))
+            else:
+                value_stack.append(self.__resolve_value(expr))
+
+        return value_stack.pop()
+
+    def __emit_infix(self, operator: str, left_value: ir.Value, left_type: ir.Type, right_value: ir.Value, right_type: ir.Type) -> tuple[ir.Value, ir.Type]:
+        """ Emits the instruction for a single infix operator on two already compiled operands """
+        b: ir.IRBuilder = self.builder
 
         value = None
         Type = None
         if isinstance(right_type, ir.IntType) and isinstance(left_type, ir.IntType):
-            Type = self.type_map['int']
-            match operator:
-                case '+':
-                    value = self.builder.add(left_value, right_value)
-                case '-':
-                    value = self.builder.sub(left_value, right_value)
-                case '*':
-                    value = self.builder.mul(left_value, right_value)
-                case '/':
-                    value = self.builder.sdiv(left_value, right_value)
-                case '%':
-                    value = self.builder.srem(left_value, right_value)
-                case '^':
-                    # TODO: Implement this (Having an issue off camera implementing this)
-                    pass
-                case '<':
-                    value = self.builder.icmp_signed('<', left_value, right_value)
-                    Type = ir.IntType(1)
-                case '<=':
-                    value = self.builder.icmp_signed('<=', left_value, right_value)
-                    Type = ir.IntType(1)
-                case '>':
-                    value = self.builder.icmp_signed('>', left_value, right_value)
-                    Type = ir.IntType(1)
-                case '>=':
-                    value = self.builder.icmp_signed('>=', left_value, right_value)
-                    Type = ir.IntType(1)
-                case '==':
-                    value = self.builder.icmp_signed('==', left_value, right_value)
-                    Type = ir.IntType(1)
+            if operator in self.COMPARISON_OPS:
+                value = b.icmp_signed(operator, left_value, right_value)
+                Type = self.bool_type
+            else:
+                # TODO: Implement '^' (Having an issue off camera implementing this)
+                op_fn: Callable | None = self.INT_ARITH_OPS.get(operator)
+                if op_fn is not None:
+                    value = op_fn(b, left_value, right_value)
+                Type = self.int_type
                 
         elif isinstance(right_type, ir.FloatType) and isinstance(left_type, ir.FloatType):
-            Type = ir.FloatType()
-            match operator:
-                case '+':
-                    value = self.builder.fadd(left_value, right_value)
-                case '-':
-                    value = self.builder.fsub(left_value, right_value)
-                case '*':
-                    value = self.builder.fmul(left_value, right_value)
-                case '/':
-                    value = self.builder.fdiv(left_value, right_value)
-                case '%':
-                    value = self.builder.frem(left_value, right_value)
-                case '^':
-                    # TODO: Implement this (Having an issue off camera implementing this)
-                    pass
-                case '<':
-                    value = self.builder.fcmp_ordered('<', left_value, right_value)
-                    Type = ir.IntType(1)
-                case '<=':
-                    value = self.builder.fcmp_ordered('<=', left_value, right_value)
-                    Type = ir.IntType(1)
-                case '>':
-                    value = self.builder.fcmp_ordered('>', left_value, right_value)
-                    Type = ir.IntType(1)
-                case '>=':
-                    value = self.builder.fcmp_ordered('>=', left_value, right_value)
-                    Type = ir.IntType(1)
-                case '==':
-                    value = self.builder.fcmp_ordered('==', left_value, right_value)
-                    Type = ir.IntType(1)
+            if operator in self.COMPARISON_OPS:
+                value = b.fcmp_ordered(operator, left_value, right_value)
+                Type = self.bool_type
+            else:
+                # TODO: Implement '^' (Having an issue off camera implementing this)
+                op_fn: Callable | None = self.FLOAT_ARITH_OPS.get(operator)
+                if op_fn is not None:
+                    value = op_fn(b, left_value, right_value)
+                Type = self.float_type
 
         return value, Type
     
@@ -337,8 +365,8 @@ class Compiler:
         name: str = node.function.value
         params: list[Expression] = node.arguments
 
-        args = []
-        types = []
+        args: list[ir.Value] = []
+        types: list[ir.Type] = []
         if len(params) > 0:
             for x in params:
                 p_val, p_type = self.__resolve_value(x)
@@ -348,7 +376,7 @@ class Compiler:
         match name:
             case 'printf':
                 ret = self.builtin_printf(params=args, return_type=types[0])
-                ret_type = self.type_map['int']
+                ret_type = self.int_type
             case _:
                 func, ret_type = self.env.lookup(name)
                 ret = self.builder.call(func, args)
@@ -361,35 +389,49 @@ class Compiler:
     # region Helper Methods
     def __resolve_value(self, node: Expression) -> tuple[ir.Value, ir.Type]:
         """ Resolves a value and returns a tuple (ir_value, ir_type) """
-        match node.type():
-            # Literals
-            case NodeType.IntegerLiteral:
-                node: IntegerLiteral = node
-                value, Type = node.value, self.type_map['int']
-                return ir.Constant(Type, value), Type
-            case NodeType.FloatLiteral:
-                node: FloatLiteral = node
-                value, Type = node.value, self.type_map['float']
-                return ir.Constant(Type, value), Type
-            case NodeType.IdentifierLiteral:
-                node: IdentifierLiteral = node
-                ptr, Type = self.env.lookup(node.value)
-                return self.builder.load(ptr), Type
-            case NodeType.BooleanLiteral:
-                node: BooleanLiteral = node
-                print(node.value)
-                return ir.Constant(ir.IntType(1), 1 if node.value else 0), ir.IntType(1)
-            case NodeType.StringLiteral:
-                node: StringLiteral = node
-                string, Type = self.__convert_string(node.value)
-                return string, Type
-            
-            # Expression Values
-            case NodeType.InfixExpression:
-                return self.__visit_infix_expression(node)
-            case NodeType.CallExpression:
-                return self.__visit_call_expression(node)
+        resolve_fn: Callable | None = self.resolve_fns.get(node.type())
+        if resolve_fn is not None:
+            return resolve_fn(node)
+
+    def __resolve_integer_literal(self, node: IntegerLiteral) -> tuple[ir.Value, ir.Type]:
+        value, Type = node.value, self.int_type
+
+        const: ir.Constant | None = self.int_consts.get(value)
+        return (const if const is not None else ir.Constant(Type, value)), Type
+
+    def __resolve_float_literal(self, node: FloatLiteral) -> tuple[ir.Value, ir.Type]:
+        # Literals are never negative (the minus sign is its own token), so -0.0 can't end up matching the 0.0 entry
+        value, Type = node.value, self.float_type
+
+        const: ir.Constant | None = self.float_consts.get(value)
+        return (const if const is not None else ir.Constant(Type, value)), Type
+
+    def __resolve_identifier_literal(self, node: IdentifierLiteral) -> tuple[ir.Value, ir.Type]:
+        ptr, Type = self.env.lookup(node.value)
+
+        load_cache: dict[ir.Value, ir.Value] = self.__block_load_cache()
+        value: ir.Value | None = load_cache.get(ptr)
+        if value is None:
+            value = self.builder.load(ptr)
+            load_cache[ptr] = value
+
+        return value, Type
+
+    def __resolve_boolean_literal(self, node: BooleanLiteral) -> tuple[ir.Value, ir.Type]:
+        return (self.true_const if node.value else self.false_const), self.bool_type
+
+    def __resolve_string_literal(self, node: StringLiteral) -> tuple[ir.Value, ir.Type]:
+        string, Type = self.__convert_string(node.value)
+        return string, Type
             
+    def __block_load_cache(self) -> dict[ir.Value, ir.Value]:
+        """ Returns the load cache for the builder's current block, starting an empty one if the builder has moved to another block """
+        if self.builder.block is not self.load_cache_block:
+            self.load_cache = {}
+            self.load_cache_block = self.builder.block
+
+        return self.load_cache
+
     def __convert_string(self, string: str) -> tuple[ir.Constant, ir.ArrayType]:
         string = string.replace('\\n', '\n\0')
         
@@ -408,8 +450,10 @@ class Compiler:
         """ Basic C builtin printf """
         func, _ = self.env.lookup('printf')
 
-        c_str = self.builder.alloca(return_type)
-        self.builder.store(params[0], c_str)
+        b: ir.IRBuilder = self.builder
+
+        c_str = b.alloca(return_type)
+        b.store(params[0], c_str)
 
         rest_params = params[1:]
 
@@ -419,14 +463,14 @@ class Compiler:
             # print(a)
             c_fmt: ir.LoadInstr = params[0]
             g_var_ptr = c_fmt.operands[0]
-            string_val = self.builder.load(g_var_ptr)
-            fmt_arg = self.builder.bitcast(string_val, ir.IntType(8).as_pointer())
-            return self.builder.call(func, [fmt_arg, *rest_params])
+            string_val = b.load(g_var_ptr)
+            fmt_arg = b.bitcast(string_val, ir.IntType(8).as_pointer())
+            return b.call(func, [fmt_arg, *rest_params])
         else:
-            """ Printing from a normal string declared within printf """
+            """ Printing from a string global, either declared within printf or reused from the load cache """
             # print("yeet %i", 23)
             # TODO: HANDLE PRINTING FLOATS
-            fmt_arg = self.builder.bitcast(self.module.get_global(f"__str_{self.counter}"), ir.IntType(8).as_pointer())
+            fmt_arg = b.bitcast(params[0], ir.IntType(8).as_pointer())
 
-            return self.builder.call(func, [fmt_arg, *rest_params])
+            return b.call(func, [fmt_arg, *rest_params])
     # endregion
@@ -3,22 +3,19 @@ from llvmlite import ir
 class Environment:
     """ Symbol Table """
     def __init__(self, records: dict[str, tuple[ir.Value, ir.Type]] = None, parent = None, name: str = "global") -> None:
-        self.records: dict[str, tuple] = records if records else {}
         self.parent: Environment | None = parent
         self.name: str = name
 
+        # A child scope starts out with a copy of everything visible in its parent, so a lookup never has to walk up the chain.
+        # The parent isn't defined into while the child scope is being compiled, so the copy can't go out of date
+        self.records: dict[str, tuple] = dict(parent.records) if parent else {}
+        if records:
+            self.records.update(records)
+
     def define(self, name: str, value: ir.Value, _type: ir.Type) -> str:
         self.records[name] = (value, _type)
         return value
     
-    def lookup(self, name: str) -> tuple[ir.Value, ir.Type]:
-        return self.__resolve(name)
-    
-    def __resolve(self, name: str) -> tuple[ir.Value, ir.Type]:
-        if name in self.records:
-            return self.records[name]
-        elif self.parent:
-            return self.parent.__resolve(name)
-        else:
-            return None
-            # raise RuntimeError(f"Undefined variable '{name}' in `{self.name}`'s scope.")
+    def lookup(self, name: str) -> tuple[ir.Value, ir.Type] | None:
+        """ Returns the (value, type) record for name, or None if it isn't defined in this scope or any of its parents """
+        return self.records.get(name)
@@ -4,7 +4,11 @@ from Compiler import Compiler
 from AST import Program
 import json
 import time
+import functools
+import hashlib
+import os
 
+import llvmlite
 from llvmlite import ir
 import llvmlite.binding as llvm
 from ctypes import CFUNCTYPE, c_int, c_float
@@ -12,9 +16,89 @@ from ctypes import CFUNCTYPE, c_int, c_float
 
 LEXER_DEBUG: bool = False
 PARSER_DEBUG: bool = False
-COMPILER_DEBUG: bool = True
+COMPILER_DEBUG: bool = True # Dumps debug/ir.ll and verifies the module, set to False for release/benchmark runs
 RUN_CODE: bool = True
 
+# Optimization settings for the LLVM pass pipeline
+OPT_LEVEL: int = 3
+SIZE_LEVEL: int = 0
+LOOP_VECTORIZE: bool = True
+SLP_VECTORIZE: bool = True
+
+# Front-end sources that decide what IR a program compiles to, their contents are part of the bitcode cache key
+COMPILER_SOURCES: tuple[str, ...] = ("Token.py", "Lexer.py", "AST.py", "Parser.py", "Environment.py", "Compiler.py")
+
+def cache_key_for(code: str) -> str:
+    """ Hashes the program source together with everything else that affects its optimized bitcode """
+    h = hashlib.blake2b(code.encode())
+
+    base_dir: str = os.path.dirname(os.path.abspath(__file__))
+    for name in COMPILER_SOURCES:
+        with open(os.path.join(base_dir, name), "rb") as f:
+            h.update(f.read())
+
+    h.update(repr((llvmlite.__version__, llvm.llvm_version_info, OPT_LEVEL, SIZE_LEVEL, LOOP_VECTORIZE, SLP_VECTORIZE)).encode())
+    return h.hexdigest()
+
+def write_cache_file(path: str, data: bytes) -> None:
+    """ Writes a cache entry to a temporary file first and then swaps it in, so a cut-short write never leaves a broken entry """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    tmp_path: str = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def load_cached_module(path: str) -> tuple[llvm.ModuleRef, bytes] | None:
+    """ Returns the cached, already optimized module at path along with its bitcode, or None if there isn't a usable one """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        bitcode: bytes = f.read()
+        try:
+            return llvm.parse_bitcode(bitcode), bitcode
+        except RuntimeError as e:
+            print(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+def notify_object_compiled(module: llvm.ModuleRef, buffer: bytes) -> None:
+    """ MCJIT object cache callback, saves the native code MCJIT just emitted for a program module """
+    write_cache_file(f"cache/{module.name}.o", buffer)
+
+def load_cached_object(module: llvm.ModuleRef) -> bytes | None:
+    """ MCJIT object cache callback, hands back previously emitted native code for a program module so codegen is skipped """
+    path: str = f"cache/{module.name}.o"
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        return f.read()
+
+@functools.cache
+def init_llvm() -> tuple[llvm.TargetMachine, llvm.ExecutionEngine]:
+    """ Initializes LLVM and builds the target machine and MCJIT engine once, every compiled module is added to that same engine """
+    llvm.initialize()
+    llvm.initialize_native_target()
+    llvm.initialize_native_asmprinter()
+
+    target_machine = llvm.Target.from_default_triple().create_target_machine()
+    target_machine.set_asm_verbosity(False)
+
+    # The engine has to be created with a module, so give it an empty one to own and add the real programs later
+    backing_module = llvm.parse_assembly("")
+    engine = llvm.create_mcjit_compiler(backing_module, target_machine)
+
+    # Program modules are named after the hash of their optimized bitcode, and MCJIT's object cache stores their native code
+    # under that name. The backing module gets compiled before the cache is attached, so it never ends up in there
+    engine.finalize_object()
+    engine.set_object_cache(notify_object_compiled, load_cached_object)
+
+    return target_machine, engine
+
+# LLVM is set up once when main.py is loaded rather than on the way to running a program
+target_machine, engine = init_llvm()
+
 if __name__ == '__main__':
     # Read from input file
     with open("tests/test.lime", "r") as f:
@@ -29,69 +113,109 @@ if __name__ == '__main__':
 # }
 # """
 
-    if LEXER_DEBUG:
-        print("===== LEXER DEBUG =====")
-        debug_lex: Lexer = Lexer(source=code)
-        while debug_lex.current_char is not None:
-            print(debug_lex.next_token())
-
-    l: Lexer = Lexer(source=code)
-    p: Parser = Parser(lexer=l)
-
-    program: Program = p.parse_program()
-    if len(p.errors) > 0:
-        for err in p.errors:
-            print(err)
-        exit(1)
-
-    if PARSER_DEBUG:
-        print("===== PARSER DEBUG =====")
-        with open("debug/ast.json", "w") as f:
-            json.dump(program.json(), f, indent=4)
-        print("Wrote AST to debug/ast.json successfully")
-
-    c: Compiler = Compiler()
-    c.compile(node=program)
-
-    # Output steps
-    module: ir.Module = c.module
-    module.triple = llvm.get_default_triple()
-
-    if COMPILER_DEBUG:
-        with open("debug/ir.ll", "w") as f:
-            f.write(str(module))
-
-    if len(c.errors) > 0:
-        print(f"==== COMPILER ERRORS ====")
-        for err in c.errors:
-            print(err)
-        exit(1)
+    # Compiled programs are cached as optimized bitcode keyed by a hash of their source and the compiler, so an unchanged
+    # program skips the Lexer, Parser, Compiler and optimization passes entirely. Any debug flag bypasses the cache, since a
+    # cache hit would skip the debug output too
+    cache_path: str = f"cache/{cache_key_for(code)}.bc"
+    use_cache: bool = RUN_CODE and not (LEXER_DEBUG or PARSER_DEBUG or COMPILER_DEBUG)
+
+    cached: tuple[llvm.ModuleRef, bytes] | None = load_cached_module(cache_path) if use_cache else None
+
+    llvm_ir_parsed: llvm.ModuleRef | None = None
+    bitcode: bytes | None = None
+    if cached is not None:
+        llvm_ir_parsed, bitcode = cached
+
+    if llvm_ir_parsed is None:
+        if LEXER_DEBUG:
+            print("===== LEXER DEBUG =====")
+            debug_lex: Lexer = Lexer(source=code)
+            while debug_lex.current_char is not None:
+                print(debug_lex.next_token())
+
+        l: Lexer = Lexer(source=code)
+        p: Parser = Parser(lexer=l)
+
+        program: Program = p.parse_program()
+        if len(p.errors) > 0:
+            for err in p.errors:
+                print(err)
+            exit(1)
+
+        if PARSER_DEBUG:
+            print("===== PARSER DEBUG =====")
+            with open("debug/ast.json", "w") as f:
+                json.dump(program.json(), f, indent=4)
+            print("Wrote AST to debug/ast.json successfully")
+
+        c: Compiler = Compiler()
+        c.compile(node=program)
+
+        # Output steps
+        module: ir.Module = c.module
+        module.triple = llvm.get_default_triple()
+
+        # Serialize the module to textual IR only once, both the debug dump and the parser below use it
+        ir_text: str = str(module)
+
+        if COMPILER_DEBUG:
+            with open("debug/ir.ll", "w") as f:
+                f.write(ir_text)
+
+        if len(c.errors) > 0:
+            print(f"==== COMPILER ERRORS ====")
+            for err in c.errors:
+                print(err)
+            exit(1)
 
     if RUN_CODE:
-        llvm.initialize()
-        llvm.initialize_native_target()
-        llvm.initialize_native_asmprinter()
-
-        try:
-            llvm_ir_parsed = llvm.parse_assembly(str(module))
-            llvm_ir_parsed.verify()
-        except Exception as e:
-            print(e)
-            raise
-
-        target_machine = llvm.Target.from_default_triple().create_target_machine()
-
-        engine = llvm.create_mcjit_compiler(llvm_ir_parsed, target_machine)
+        if llvm_ir_parsed is None:
+            # llvmlite's ir.Module can only be rendered as textual IR (it has no bitcode writer), so parsing the text is
+            # the one way into the binding layer. Bitcode is only used for the cached, already optimized module
+            try:
+                llvm_ir_parsed = llvm.parse_assembly(ir_text)
+
+                # The verifier walks the whole module, so it only runs alongside the other compiler debugging output
+                if COMPILER_DEBUG:
+                    llvm_ir_parsed.verify()
+            except Exception as e:
+                print(e)
+                raise
+
+            # Run LLVM's optimization passes (mem2reg, instcombine, GVN, SROA, ...) over the module before handing it to the JIT,
+            # so all the alloca/load/store traffic the Compiler emits gets collapsed into registers
+            pmb = llvm.create_pass_manager_builder()
+            pmb.opt_level = OPT_LEVEL
+            pmb.size_level = SIZE_LEVEL
+            pmb.loop_vectorize = LOOP_VECTORIZE
+            pmb.slp_vectorize = SLP_VECTORIZE
+
+            pm = llvm.create_module_pass_manager()
+            target_machine.add_analysis_passes(pm)
+            pmb.populate(pm)
+            pm.run(llvm_ir_parsed)
+
+            bitcode = llvm_ir_parsed.as_bitcode()
+            write_cache_file(cache_path, bitcode)
+
+        # Key the object cache by the bitcode of the module handed to MCJIT, so a changed compiler can never pick up stale
+        # native code. Both paths hash the same stored bytes, since re-serializing a module read back from bitcode gives
+        # different bytes than the original
+        llvm_ir_parsed.name = hashlib.blake2b(bitcode).hexdigest()
+        engine.add_module(llvm_ir_parsed)
         engine.finalize_object()
 
         # Run the function with the name 'main'. This is the entry point function of the entire program
         entry = engine.get_function_address('main')
         cfunc = CFUNCTYPE(c_int)(entry)
 
-        st = time.time()
+        st = time.perf_counter_ns()
 
         result = cfunc()
 
-        et = time.time()
+        et = time.perf_counter_ns()
+
+        print(f'\n\nProgram returned: {result}\n=== Executed in {(et - st) / 1e6:.6f} ms. ===')
 
-        print(f'\n\nProgram returned: {result}\n=== Executed in {round((et - st) * 1000, 6)} ms. ===')
+        # Free the program's code, leaving the engine ready for the next module
+        engine.remove_module(llvm_ir_parsed)